@@ -1,8 +1,138 @@
 """Bear URL scheme operations for creating and modifying notes."""
 
+import contextvars
+import functools
+import logging
+import string
 import subprocess
-import urllib.parse
-from typing import Optional
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Incremented whenever a modifying command is sent to Bear, so that callers
+# caching database reads can tell their results may be stale.
+_write_generation = 0
+
+# URLs queued inside batched(); None when commands are sent immediately.
+_pending_urls: contextvars.ContextVar[list[str] | None] = contextvars.ContextVar(
+    "_pending_urls", default=None
+)
+
+# x-callback-url endpoints; the query string is appended directly.
+_URL_CREATE = "bear://x-callback-url/create?"
+_URL_ADD_TEXT = "bear://x-callback-url/add-text?"
+_URL_ADD_TAGS = "bear://x-callback-url/add-tags?"
+_URL_TRASH = "bear://x-callback-url/trash?"
+_URL_OPEN_NOTE = "bear://x-callback-url/open-note?"
+_URL_SEARCH = "bear://x-callback-url/search?"
+_URL_ARCHIVE = "bear://x-callback-url/archive?"
+_URL_UNARCHIVE = "bear://x-callback-url/unarchive?"
+_URL_OPEN_TAG = "bear://x-callback-url/open-tag?"
+_URL_RENAME_TAG = "bear://x-callback-url/rename-tag?"
+
+# Insertion modes accepted by Bear's /add-text endpoint
+_ADD_TEXT_MODES = frozenset(("append", "prepend", "replace"))
+
+# Bytes that urllib.parse.urlencode leaves as-is, and a per-byte table giving
+# the same encoding it produces (quote_plus with safe=""). Indexing a list per
+# UTF-8 byte is much cheaper than urllib's Quoter lookups on large note texts.
+_UNRESERVED = (string.ascii_letters + string.digits + "_.-~").encode("ascii")
+_QUOTE_TABLE = [
+    chr(b) if b in _UNRESERVED else "+" if b == 0x20 else f"%{b:02X}"
+    for b in range(256)
+]
+
+
+def _quote(value: str) -> str:
+    """Percent-encode a query component like urllib.parse.quote_plus."""
+    data = value.encode("utf-8")
+    if not data.translate(None, _UNRESERVED):
+        return value
+    table = _QUOTE_TABLE
+    return "".join([table[b] for b in data])
+
+
+def _encode_query(params: dict[str, str]) -> str:
+    """Build a query string, equivalent to urllib.parse.urlencode(params)."""
+    return "&".join([f"{_quote(key)}={_quote(value)}" for key, value in params.items()])
+
+
+def write_generation() -> int:
+    """Return a counter that changes every time a write is sent to Bear."""
+    return _write_generation
+
+
+def _mark_written() -> None:
+    """Record that a modifying command is being sent to Bear."""
+    global _write_generation
+    _write_generation += 1
+
+
+@functools.cache
+def _launch_services() -> tuple[Any, Any] | None:
+    """Return (shared NSWorkspace, NSURL class), or None if pyobjc is missing."""
+    try:
+        from AppKit import NSWorkspace
+        from Foundation import NSURL
+    except ImportError:
+        return None
+    return NSWorkspace.sharedWorkspace(), NSURL
+
+
+def _reap_open(proc: subprocess.Popen, urls: list[str]) -> None:
+    """Wait for an 'open' process to exit, logging any failure it reports."""
+    _, stderr = proc.communicate()
+    if proc.returncode:
+        message = stderr.decode("utf-8", "replace").strip()
+        logger.warning(
+            "'open' exited with status %d for %s: %s",
+            proc.returncode, ", ".join(urls), message,
+        )
+
+
+def _dispatch_urls(urls: list[str]) -> None:
+    """
+    Hand URLs to Launch Services, in order.
+
+    Uses NSWorkspace in-process when pyobjc is installed, which avoids
+    spawning /usr/bin/open for every call. Falls back to a single 'open'
+    command for all URLs otherwise, without waiting for it to exit: Bear
+    handles x-callback-urls asynchronously, so the caller gains nothing by
+    blocking. The process is reaped on a background thread, which logs a
+    failure such as no application handling bear:// URLs.
+
+    Args:
+        urls: The URLs to open
+
+    Raises:
+        RuntimeError: If Launch Services rejects a URL
+        OSError: If the 'open' command cannot be started
+    """
+    launch_services = _launch_services()
+    if launch_services is None:
+        # Use macOS 'open' command to trigger Bear's URL scheme; it accepts
+        # several URLs, so a batch costs one process like a single call.
+        # close_fds=False lets CPython take the posix_spawn() fast path
+        # instead of fork()+exec(); the standard streams are redirected so
+        # the child never touches the MCP stdio transport.
+        proc = subprocess.Popen(
+            ["open", *urls],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
+        )
+        threading.Thread(target=_reap_open, args=(proc, urls), daemon=True).start()
+        return
+
+    workspace, nsurl = launch_services
+    for url in urls:
+        ns_url = nsurl.URLWithString_(url)
+        if ns_url is None or not workspace.openURL_(ns_url):
+            raise RuntimeError(f"Launch Services could not open {url}")
 
 
 def _open_bear_url(url: str) -> dict[str, str]:
@@ -15,16 +145,65 @@ def _open_bear_url(url: str) -> dict[str, str]:
     Returns:
         Dictionary with result information
     """
+    pending = _pending_urls.get()
+    if pending is not None:
+        pending.append(url)
+        return {"success": True, "message": "Command queued for Bear"}
+
     try:
-        # Use macOS 'open' command to trigger Bear's URL scheme
-        subprocess.run(["open", url], check=True, capture_output=True)
+        _dispatch_urls([url])
         return {"success": True, "message": "Command sent to Bear successfully"}
-    except subprocess.CalledProcessError as e:
-        return {"success": False, "error": str(e)}
     except Exception as e:
         return {"success": False, "error": f"Failed to open Bear URL: {str(e)}"}
 
 
+def batch_invoke(urls: list[str]) -> dict[str, str]:
+    """
+    Send several Bear x-callback-urls in one go.
+
+    Only suitable for commands whose outcome is checked later (or not at
+    all): Bear processes them in order but reports nothing back.
+
+    Args:
+        urls: The Bear x-callback-urls to open, in order
+
+    Returns:
+        Dictionary with result information
+    """
+    if not urls:
+        return {"success": True, "message": "No commands to send"}
+
+    try:
+        _dispatch_urls(urls)
+        return {"success": True, "message": f"{len(urls)} commands sent to Bear successfully"}
+    except Exception as e:
+        return {"success": False, "error": f"Failed to open Bear URLs: {str(e)}"}
+
+
+@contextmanager
+def batched() -> Iterator[dict[str, str]]:
+    """
+    Queue the commands issued in this block and send them together on exit.
+
+    The operations in this module return a "queued" result while the block
+    is active. The yielded dictionary is filled with the batch_invoke()
+    result once the block exits without an exception.
+
+    Example:
+        with batched() as result:
+            unarchive_note(note_id)
+            open_tag("mcp")
+    """
+    urls: list[str] = []
+    result: dict[str, str] = {}
+    token = _pending_urls.set(urls)
+    try:
+        yield result
+    finally:
+        _pending_urls.reset(token)
+    result.update(batch_invoke(urls))
+
+
 def create_note(
     title: Optional[str] = None,
     text: Optional[str] = None,
@@ -59,9 +238,10 @@ def create_note(
     if open_note:
         params["open_note"] = "yes"
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/create?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_CREATE + query_string
 
+    _mark_written()
     return _open_bear_url(url)
 
 
@@ -69,7 +249,8 @@ def add_text(
     note_id: str,
     text: str,
     mode: str = "append",
-    open_note: bool = False
+    open_note: bool = False,
+    tags: Optional[list[str]] = None
 ) -> dict[str, str]:
     """
     Add text to an existing note.
@@ -79,11 +260,12 @@ def add_text(
         text: Text to add
         mode: Where to add text - "append", "prepend", or "replace"
         open_note: Open the note in Bear after modification
+        tags: List of tags to add in the same call (without # prefix)
 
     Returns:
         Dictionary with operation result
     """
-    if mode not in ["append", "prepend", "replace"]:
+    if mode not in _ADD_TEXT_MODES:
         return {"success": False, "error": f"Invalid mode: {mode}. Use append, prepend, or replace"}
 
     params = {
@@ -92,12 +274,16 @@ def add_text(
         "mode": mode
     }
 
+    if tags:
+        # Bear's /add-text accepts tags, saving a separate /add-tags call
+        params["tags"] = ",".join(tags)
     if open_note:
         params["open_note"] = "yes"
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/add-text?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_ADD_TEXT + query_string
 
+    _mark_written()
     return _open_bear_url(url)
 
 
@@ -120,9 +306,10 @@ def add_tags_to_note(
         "tags": ",".join(tags)
     }
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/add-tags?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_ADD_TAGS + query_string
 
+    _mark_written()
     return _open_bear_url(url)
 
 
@@ -138,9 +325,10 @@ def trash_note(note_id: str) -> dict[str, str]:
     """
     params = {"id": note_id}
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/trash?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_TRASH + query_string
 
+    _mark_written()
     return _open_bear_url(url)
 
 
@@ -156,8 +344,8 @@ def open_note(note_id: str) -> dict[str, str]:
     """
     params = {"id": note_id}
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/open-note?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_OPEN_NOTE + query_string
 
     return _open_bear_url(url)
 
@@ -174,8 +362,8 @@ def search_in_bear(term: str) -> dict[str, str]:
     """
     params = {"term": term}
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/search?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_SEARCH + query_string
 
     return _open_bear_url(url)
 
@@ -192,9 +380,10 @@ def archive_note(note_id: str) -> dict[str, str]:
     """
     params = {"id": note_id}
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/archive?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_ARCHIVE + query_string
 
+    _mark_written()
     return _open_bear_url(url)
 
 
@@ -210,9 +399,10 @@ def unarchive_note(note_id: str) -> dict[str, str]:
     """
     params = {"id": note_id}
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/unarchive?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_UNARCHIVE + query_string
 
+    _mark_written()
     return _open_bear_url(url)
 
 
@@ -228,8 +418,8 @@ def open_tag(tag: str) -> dict[str, str]:
     """
     params = {"name": tag}
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/open-tag?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_OPEN_TAG + query_string
 
     return _open_bear_url(url)
 
@@ -250,7 +440,8 @@ def rename_tag(old_tag: str, new_tag: str) -> dict[str, str]:
         "new_name": new_tag
     }
 
-    query_string = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/rename-tag?{query_string}"
+    query_string = _encode_query(params)
+    url = _URL_RENAME_TAG + query_string
 
+    _mark_written()
     return _open_bear_url(url)
@@ -1,16 +1,147 @@
 """Database access functions for Bear Notes."""
 
+import atexit
+import functools
 import sqlite3
 import os
+import re
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 from dotenv import load_dotenv
 
 load_dotenv()
 
-
-def get_bear_db_path() -> str:
-    """Get the path to Bear's SQLite database."""
+# The server is long-lived, so a single connection is opened on first use and
+# shared by every query; streamed results get a short-lived one of their own.
+# sqlite3 connections are not safe for concurrent use, hence the lock.
+_conn: sqlite3.Connection | None = None
+_conn_lock = threading.Lock()
+
+# Rows fetched per fetchmany() call when streaming results
+_ITER_CHUNK_SIZE = 256
+
+# Note columns that list queries can return, and the default projection. The
+# note body (ZTEXT) is usually most of the bytes, so listings leave it out
+# unless it is asked for.
+NOTE_FIELDS = (
+    "ZCREATIONDATE",
+    "ZMODIFICATIONDATE",
+    "ZARCHIVED",
+    "ZSUBTITLE",
+    "ZTEXT",
+    "ZTITLE",
+    "ZUNIQUEIDENTIFIER",
+)
+DEFAULT_NOTE_FIELDS = ("ZTITLE", "ZUNIQUEIDENTIFIER", "ZSUBTITLE")
+
+# Only the columns returned to callers are selected; ZSFNOTE also carries wide
+# columns such as ZENCRYPTEDDATA that would otherwise be decoded per row.
+# Queries are module constants so sqlite3's statement cache always hits.
+_NOTE_LIST_FIELDS = ("ZCREATIONDATE", "ZSUBTITLE", "ZTEXT", "ZTITLE", "ZUNIQUEIDENTIFIER")
+_NOTE_LIST_COLUMNS = ", ".join(_NOTE_LIST_FIELDS)
+# Every note field, for lookups that return the whole note
+_NOTE_COLUMNS = ", ".join(NOTE_FIELDS)
+# Every note field but the body, for search results
+_NOTE_LIGHT_FIELDS = tuple(field for field in NOTE_FIELDS if field != "ZTEXT")
+
+_SQL_NOTES = "SELECT {columns} FROM ZSFNOTE WHERE ZARCHIVED=0;"
+_SQL_NOTES_LIKE = """
+    SELECT {columns} FROM ZSFNOTE
+    WHERE ZARCHIVED=0
+    AND (ZTEXT LIKE ? OR ZTITLE LIKE ?);
+"""
+_SQL_TAGS = "SELECT ZTITLE FROM ZSFNOTETAG;"
+_SQL_TAGS_JSON = "SELECT json_group_array(ZTITLE) FROM ZSFNOTETAG;"
+_SQL_NOTE_BY_ID = f"SELECT {_NOTE_COLUMNS} FROM ZSFNOTE WHERE ZUNIQUEIDENTIFIER=?;"
+_SQL_NOTES_BY_TAG = f"""
+    SELECT {_NOTE_LIST_COLUMNS} FROM ZSFNOTE
+    WHERE ZARCHIVED=0 AND ZTRASHED=0
+    AND ZTEXT LIKE ?;
+"""
+_SQL_ARCHIVED_NOTES = "SELECT {columns} FROM ZSFNOTE WHERE ZARCHIVED=1;"
+_SQL_NOTE_ARCHIVED = "SELECT ZARCHIVED FROM ZSFNOTE WHERE ZUNIQUEIDENTIFIER=? LIMIT 1;"
+_SQL_COUNT_ARCHIVED_NOTES = "SELECT COUNT(*) FROM ZSFNOTE WHERE ZARCHIVED=1;"
+
+# Substring searches are served from a trigram FTS5 index kept in the
+# connection's temp schema, since Bear's own file must not be modified. The
+# index only narrows the candidate rows; the original LIKE is still applied
+# to them, so results are identical to a full scan.
+#
+# The index holds a copy of every note body, plus roughly three times that in
+# trigrams, in memory (temp_store=MEMORY) for the life of the server.
+#
+# Rows are re-indexed when their Core Data version counter (Z_OPT) changes.
+# Core Data bumps it on every save, including changes synced from other
+# devices, whereas ZMODIFICATIONDATE can move backwards or stay put. The last
+# indexed Z_OPT of each row is kept in a temp side table.
+_SQL_FTS_CREATE = (
+    "CREATE VIRTUAL TABLE temp.notes_fts USING fts5(ZTITLE, ZTEXT, tokenize='trigram');"
+)
+_SQL_FTS_STATE_CREATE = "CREATE TABLE temp.notes_fts_state(rowid INTEGER PRIMARY KEY, opt INTEGER);"
+# Indexed rows that were deleted or saved since they were indexed
+_SQL_FTS_STALE = """
+    SELECT s.rowid FROM temp.notes_fts_state s
+    LEFT JOIN main.ZSFNOTE n ON n.Z_PK = s.rowid
+    WHERE n.Z_PK IS NULL OR n.Z_OPT IS NOT s.opt
+"""
+_SQL_FTS_DELETE_STALE = f"DELETE FROM temp.notes_fts WHERE rowid IN ({_SQL_FTS_STALE});"
+_SQL_FTS_STATE_DELETE_STALE = f"DELETE FROM temp.notes_fts_state WHERE rowid IN ({_SQL_FTS_STALE});"
+_SQL_FTS_INSERT_NEW = """
+    INSERT INTO temp.notes_fts(rowid, ZTITLE, ZTEXT)
+    SELECT Z_PK, ZTITLE, ZTEXT FROM main.ZSFNOTE
+    WHERE Z_PK NOT IN (SELECT rowid FROM temp.notes_fts_state);
+"""
+_SQL_FTS_STATE_INSERT_NEW = """
+    INSERT INTO temp.notes_fts_state(rowid, opt)
+    SELECT Z_PK, Z_OPT FROM main.ZSFNOTE
+    WHERE Z_PK NOT IN (SELECT rowid FROM temp.notes_fts_state);
+"""
+_SQL_NOTE_COLUMN_INFO = "PRAGMA main.table_info(ZSFNOTE);"
+_SQL_DATA_VERSION = "PRAGMA data_version;"
+_SQL_NOTES_LIKE_FTS = """
+    SELECT {columns} FROM ZSFNOTE
+    WHERE ZARCHIVED=0
+    AND Z_PK IN (SELECT rowid FROM temp.notes_fts WHERE notes_fts MATCH ?)
+    AND (ZTEXT LIKE ? OR ZTITLE LIKE ?);
+"""
+_SQL_NOTES_BY_TAG_FTS = f"""
+    SELECT {_NOTE_LIST_COLUMNS} FROM ZSFNOTE
+    WHERE ZARCHIVED=0 AND ZTRASHED=0
+    AND Z_PK IN (SELECT rowid FROM temp.notes_fts WHERE notes_fts MATCH ?)
+    AND ZTEXT LIKE ?;
+"""
+
+# Bear links notes to tags through a Core Data join table whose name depends on
+# the schema version (Z_5TAGS, Z_7TAGS, ...), so it is discovered at runtime.
+# GLOB only preselects; other join tables such as Z_5PINNEDINTAGS match it too.
+_SQL_TAG_JOIN_TABLES = "SELECT name FROM sqlite_master WHERE type='table' AND name GLOB 'Z_[0-9]*TAGS';"
+_TAG_JOIN_TABLE_RE = re.compile(r"Z_\d+TAGS")
+_TAG_JOIN_NOTES_COLUMN_RE = re.compile(r"Z_\d+NOTES")
+_TAG_JOIN_TAGS_COLUMN_RE = re.compile(r"Z_\d+TAGS")
+_SQL_NOTES_BY_TAG_JOIN = f"""
+    SELECT {_NOTE_LIST_COLUMNS} FROM ZSFNOTE
+    WHERE ZARCHIVED=0 AND ZTRASHED=0
+    AND Z_PK IN (
+        SELECT j."{{notes_column}}" FROM "{{join_table}}" j
+        JOIN ZSFNOTETAG t ON t.Z_PK = j."{{tags_column}}"
+        WHERE t.ZTITLE = ? COLLATE NOCASE
+    );
+"""
+
+# Tag join query for this database: None until probed, "" if not found.
+_sql_notes_by_tag_join: str | None = None
+
+# FTS index state: None until probed, False if this SQLite lacks FTS5 trigram
+# or the notes table has no Z_OPT column to detect changes with.
+_fts_available: bool | None = None
+_fts_data_version: int | None = None
+
+
+def _resolve_bear_db_path() -> str:
+    """Resolve Bear's database path from DB_ROUTE or the default location."""
     db_route = os.getenv("DB_ROUTE")
     if db_route:
         return db_route
@@ -23,83 +154,380 @@ def get_bear_db_path() -> str:
     )
 
 
-def get_notes() -> list[dict[str, Any]]:
-    """Retrieve all non-archived notes from Bear."""
-    db_path = get_bear_db_path()
-    conn = sqlite3.connect(db_path)
+# Resolved once at import; the location does not change while running.
+_DB_PATH = _resolve_bear_db_path()
+
+
+def get_bear_db_path() -> str:
+    """Get the path to Bear's SQLite database."""
+    return _DB_PATH
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a read-only connection to Bear's database."""
+    # Read-only: Bear's file is never locked for writing by this process.
+    # immutable=1 is deliberately not used: Bear keeps writing while the
+    # server runs, and immutable mode skips locking and the WAL file, so
+    # recent edits would be missed or torn pages read.
+    # Autocommit mode: no transaction is left open between queries, so
+    # every statement sees Bear's latest committed changes.
+    conn = sqlite3.connect(
+        Path(get_bear_db_path()).absolute().as_uri() + "?mode=ro",
+        uri=True,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=256,
+    )
     conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    # Bear owns the database file, so only connection-local settings are
+    # changed here (journal_mode would be persisted into Bear's file).
+    # query_only is not set: it would also block the temp FTS index.
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-65536;")  # 64 MiB page cache
+    conn.execute("PRAGMA mmap_size=268435456;")
+    return conn
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the shared connection to Bear's database, opening it if needed."""
+    global _conn
+    if _conn is None:
+        _conn = _connect()
+    return _conn
+
+
+@atexit.register
+def _close_conn() -> None:
+    """Close the shared connection when the interpreter exits."""
+    global _conn
+    with _conn_lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+@contextmanager
+def _cursor() -> Iterator[sqlite3.Cursor]:
+    """Yield a cursor on the shared connection while holding its lock."""
+    with _conn_lock:
+        cursor = _get_conn().cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+
+def _iter_rows(sql: str, params: tuple[Any, ...] = ()) -> Iterator[sqlite3.Row]:
+    """
+    Yield a query's rows, a chunk at a time.
 
+    Rows are streamed from a connection of their own, opened for this query
+    and closed once it is exhausted or the generator is closed. An unfinished
+    SELECT pins its connection's read snapshot, so doing this on the shared
+    connection would hide Bear's newer commits from every other query.
+    """
+    conn = _connect()
     try:
-        cursor.execute("SELECT * FROM ZSFNOTE WHERE ZARCHIVED=0;")
-        rows = cursor.fetchall()
-
-        notes = []
-        for row in rows:
-            notes.append({
-                "ZCREATIONDATE": row["ZCREATIONDATE"],
-                "ZSUBTITLE": row["ZSUBTITLE"],
-                "ZTEXT": row["ZTEXT"],
-                "ZTITLE": row["ZTITLE"],
-                "ZUNIQUEIDENTIFIER": row["ZUNIQUEIDENTIFIER"],
-            })
-
-        return notes
+        cursor = conn.execute(sql, params)
+        cursor.arraysize = _ITER_CHUNK_SIZE
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                return
+            yield from rows
     finally:
         conn.close()
 
 
-def get_notes_like(search_text: str) -> list[dict[str, Any]]:
-    """Search for notes containing specific text in title or body."""
-    db_path = get_bear_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+def _sync_fts(cursor: sqlite3.Cursor) -> bool:
+    """
+    Bring the temp FTS index up to date with Bear's notes.
 
+    Notes saved since they were indexed (their Z_OPT differs) are re-indexed,
+    new notes are added and deleted notes are dropped. Nothing is done unless
+    another connection (i.e. Bear) has committed since the last sync.
+
+    Args:
+        cursor: Cursor on the shared connection (lock must be held)
+
+    Returns:
+        True if the index can be used, False if it is unavailable
+    """
+    global _fts_available, _fts_data_version
+    if _fts_available is None:
+        columns = {row["name"] for row in cursor.execute(_SQL_NOTE_COLUMN_INFO)}
+        _fts_available = False
+        if "Z_OPT" in columns:
+            try:
+                cursor.execute(_SQL_FTS_CREATE)
+                cursor.execute(_SQL_FTS_STATE_CREATE)
+                _fts_available = True
+            except sqlite3.OperationalError:
+                pass
+    if not _fts_available:
+        return False
+
+    # Common case: Bear has not committed since the last sync, so there is no
+    # need for a transaction at all.
+    if cursor.execute(_SQL_DATA_VERSION).fetchone()[0] == _fts_data_version:
+        return True
+
+    cursor.execute("BEGIN;")
     try:
-        # Use parameterized query to prevent SQL injection
-        query = """
-            SELECT * FROM ZSFNOTE
-            WHERE ZARCHIVED=0
-            AND (ZTEXT LIKE ? OR ZTITLE LIKE ?);
-        """
-        search_pattern = f"%{search_text}%"
-        cursor.execute(query, (search_pattern, search_pattern))
-        rows = cursor.fetchall()
-
-        notes = []
-        for row in rows:
-            notes.append({
-                "ZCREATIONDATE": row["ZCREATIONDATE"],
-                "ZSUBTITLE": row["ZSUBTITLE"],
-                "ZTEXT": row["ZTEXT"],
-                "ZTITLE": row["ZTITLE"],
-                "ZUNIQUEIDENTIFIER": row["ZUNIQUEIDENTIFIER"],
-            })
-
-        return notes
-    finally:
-        conn.close()
+        data_version = cursor.execute(_SQL_DATA_VERSION).fetchone()[0]
+        if data_version != _fts_data_version:
+            cursor.execute(_SQL_FTS_DELETE_STALE)
+            cursor.execute(_SQL_FTS_STATE_DELETE_STALE)
+            cursor.execute(_SQL_FTS_INSERT_NEW)
+            cursor.execute(_SQL_FTS_STATE_INSERT_NEW)
+            _fts_data_version = data_version
+        cursor.execute("COMMIT;")
+    except BaseException:
+        cursor.execute("ROLLBACK;")
+        raise
+    return True
+
+
+def _notes_by_tag_join_sql(cursor: sqlite3.Cursor) -> str:
+    """
+    Return the query selecting notes through Bear's note/tag join table.
+
+    The join table and its columns are looked up in the schema on first use
+    and the resulting query is cached. Unless exactly one table fits, the
+    caller falls back to searching note text.
+
+    Args:
+        cursor: Cursor on the shared connection (lock must be held)
+
+    Returns:
+        The SQL query, or an empty string if no single join table was found
+    """
+    global _sql_notes_by_tag_join
+    if _sql_notes_by_tag_join is None:
+        candidates = []
+        for (table,) in cursor.execute(_SQL_TAG_JOIN_TABLES).fetchall():
+            if not _TAG_JOIN_TABLE_RE.fullmatch(table):
+                continue
+            columns = [row["name"] for row in cursor.execute(f'PRAGMA table_info("{table}");')]
+            notes_columns = [c for c in columns if _TAG_JOIN_NOTES_COLUMN_RE.fullmatch(c)]
+            tags_columns = [c for c in columns if _TAG_JOIN_TAGS_COLUMN_RE.fullmatch(c)]
+            if len(notes_columns) == 1 and len(tags_columns) == 1:
+                candidates.append(_SQL_NOTES_BY_TAG_JOIN.format(
+                    join_table=table,
+                    notes_column=notes_columns[0],
+                    tags_column=tags_columns[0],
+                ))
+        _sql_notes_by_tag_join = candidates[0] if len(candidates) == 1 else ""
+    return _sql_notes_by_tag_join
+
+
+def _fts_phrase(text: str) -> str | None:
+    """
+    Build an FTS5 phrase matching text as a substring.
+
+    Returns None when the trigram index cannot narrow the search: fewer than
+    three characters, or LIKE wildcards that a phrase cannot express.
+    """
+    if len(text) < 3 or "%" in text or "_" in text:
+        return None
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _note_fields(fields: Sequence[str]) -> tuple[str, ...]:
+    """
+    Validate requested note fields, dropping duplicates.
+
+    Raises:
+        ValueError: If no fields or an unknown field are requested
+    """
+    if not fields:
+        raise ValueError("At least one note field is required")
+    unknown = [field for field in fields if field not in NOTE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown note fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(fields))
+
+
+@functools.lru_cache(maxsize=64)
+def _projection_sql(template: str, fields: tuple[str, ...]) -> str:
+    """Fill a query template's column list, once per distinct projection."""
+    return template.format(columns=", ".join(fields))
+
+
+@functools.lru_cache(maxsize=64)
+def _json_array_sql(sql: str, fields: tuple[str, ...]) -> str:
+    """Wrap a row query so SQLite returns its rows as one JSON array and a count."""
+    pairs = ", ".join(f"'{field}', {field}" for field in fields)
+    return (
+        f"SELECT json_group_array(json_object({pairs})), COUNT(*) "
+        f"FROM ({sql.strip().rstrip(';')});"
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _count_sql(sql: str) -> str:
+    """Wrap a row query so SQLite only returns how many rows it matches."""
+    return f"SELECT COUNT(*) FROM ({sql.strip().rstrip(';')});"
+
+
+@functools.lru_cache(maxsize=8)
+def _limit_sql(sql: str) -> str:
+    """Add a LIMIT parameter to a row query."""
+    return f"{sql.strip().rstrip(';')} LIMIT ?;"
+
+
+@functools.lru_cache(maxsize=8)
+def _json_object_sql(sql: str, fields: tuple[str, ...]) -> str:
+    """Wrap a single-row query so SQLite returns the row as a JSON object."""
+    pairs = ", ".join(f"'{field}', {field}" for field in fields)
+    return f"SELECT json_object({pairs}) FROM ({sql.strip().rstrip(';')});"
+
+
+def _fetch_json_array(
+    sql: str,
+    params: tuple[Any, ...],
+    fields: tuple[str, ...],
+    cursor: sqlite3.Cursor
+) -> tuple[str, int]:
+    """Run a row query, returning (JSON array of rows, row count)."""
+    cursor.execute(_json_array_sql(sql, fields), params)
+    notes_json, count = cursor.fetchone()
+    return notes_json, count
+
+
+def _notes_like_fields(include_text: bool) -> tuple[str, ...]:
+    """Return the columns a substring search selects."""
+    return NOTE_FIELDS if include_text else _NOTE_LIGHT_FIELDS
+
+
+def _notes_like_query(
+    search_text: str,
+    fields: tuple[str, ...],
+    cursor: sqlite3.Cursor
+) -> tuple[str, tuple[Any, ...]]:
+    """Choose the query and parameters for a substring search."""
+    # Use parameterized query to prevent SQL injection
+    search_pattern = f"%{search_text}%"
+    phrase = _fts_phrase(search_text)
+    if phrase is not None and _sync_fts(cursor):
+        sql = _projection_sql(_SQL_NOTES_LIKE_FTS, fields)
+        return sql, (phrase, search_pattern, search_pattern)
+    return _projection_sql(_SQL_NOTES_LIKE, fields), (search_pattern, search_pattern)
+
+
+def _notes_by_tag_query(
+    tag: str,
+    cursor: sqlite3.Cursor,
+    limit: int | None = None
+) -> tuple[str, tuple[Any, ...]]:
+    """Choose the query and parameters for a tag lookup."""
+    sql, params = _notes_by_tag_base_query(tag, cursor)
+    if limit is None:
+        return sql, params
+    return _limit_sql(sql), (*params, limit)
+
+
+def _notes_by_tag_base_query(tag: str, cursor: sqlite3.Cursor) -> tuple[str, tuple[Any, ...]]:
+    """Choose the unlimited query and parameters for a tag lookup."""
+    join_sql = _notes_by_tag_join_sql(cursor)
+    if join_sql:
+        return join_sql, (tag,)
+
+    # Unknown schema: search for the tag in note text (Bear stores tags
+    # inline as #tag)
+    search_pattern = f"%#{tag}%"
+    phrase = _fts_phrase(f"#{tag}")
+    if phrase is not None and _sync_fts(cursor):
+        return _SQL_NOTES_BY_TAG_FTS, (phrase, search_pattern)
+    return _SQL_NOTES_BY_TAG, (search_pattern,)
+
+
+def row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
+    """
+    Convert a note row to a plain dictionary.
+
+    Rows returned by this module can be indexed by column name or position
+    like a read-only dictionary. Use this where a real dict is needed, e.g.
+    for .get(), JSON serialization or modification.
+    """
+    return dict(row)
+
+
+def get_notes(fields: Sequence[str] = DEFAULT_NOTE_FIELDS) -> list[sqlite3.Row]:
+    """
+    Retrieve all non-archived notes from Bear.
+
+    Args:
+        fields: Note columns to return (see NOTE_FIELDS)
+
+    Returns:
+        List of notes with the requested fields
+    """
+    sql = _projection_sql(_SQL_NOTES, _note_fields(fields))
+    with _cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchall()
+
+
+def get_notes_json(fields: Sequence[str] = DEFAULT_NOTE_FIELDS) -> tuple[str, int]:
+    """
+    Like get_notes, but serialized to JSON by SQLite.
+
+    Returns:
+        Tuple of (JSON array of notes, number of notes)
+    """
+    fields = _note_fields(fields)
+    sql = _projection_sql(_SQL_NOTES, fields)
+    with _cursor() as cursor:
+        return _fetch_json_array(sql, (), fields, cursor)
+
+
+def get_notes_like(search_text: str, *, include_text: bool = False) -> list[sqlite3.Row]:
+    """
+    Search for notes containing specific text in title or body.
+
+    Matches carry every note field, including dates and archive state, so
+    callers do not need a follow-up get_note_by_id. The body (ZTEXT) is
+    only included when asked for.
+
+    Args:
+        search_text: Text to look for
+        include_text: Also return each note's body
+    """
+    fields = _notes_like_fields(include_text)
+    with _cursor() as cursor:
+        cursor.execute(*_notes_like_query(search_text, fields, cursor))
+        return cursor.fetchall()
+
+
+def get_notes_like_json(search_text: str, *, include_text: bool = False) -> tuple[str, int]:
+    """
+    Like get_notes_like, but serialized to JSON by SQLite.
+
+    Returns:
+        Tuple of (JSON array of notes, number of notes)
+    """
+    fields = _notes_like_fields(include_text)
+    with _cursor() as cursor:
+        sql, params = _notes_like_query(search_text, fields, cursor)
+        return _fetch_json_array(sql, params, fields, cursor)
 
 
 def get_tags() -> list[str]:
     """Retrieve all tags from Bear notes."""
-    db_path = get_bear_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    with _cursor() as cursor:
+        cursor.execute(_SQL_TAGS)
+        return [row["ZTITLE"] for row in cursor]
 
-    try:
-        cursor.execute("SELECT * FROM ZSFNOTETAG;")
-        rows = cursor.fetchall()
 
-        tags = [row["ZTITLE"] for row in rows]
-        return tags
-    finally:
-        conn.close()
+def get_tags_json() -> str:
+    """Like get_tags, but returned as a JSON array built by SQLite."""
+    with _cursor() as cursor:
+        cursor.execute(_SQL_TAGS_JSON)
+        return cursor.fetchone()[0]
 
 
-def get_note_by_id(note_id: str) -> dict[str, Any] | None:
+def get_note_by_id(note_id: str) -> sqlite3.Row | None:
     """
     Get a specific note by its unique identifier.
 
@@ -107,104 +535,130 @@ def get_note_by_id(note_id: str) -> dict[str, Any] | None:
         note_id: The unique identifier of the note (ZUNIQUEIDENTIFIER)
 
     Returns:
-        Note dictionary or None if not found
+        Note row or None if not found
     """
-    db_path = get_bear_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    with _cursor() as cursor:
+        cursor.execute(_SQL_NOTE_BY_ID, (note_id,))
+        return cursor.fetchone()
 
-    try:
-        cursor.execute(
-            "SELECT * FROM ZSFNOTE WHERE ZUNIQUEIDENTIFIER=?;",
-            (note_id,)
-        )
+
+def get_note_by_id_json(note_id: str) -> str | None:
+    """
+    Like get_note_by_id, but serialized to JSON by SQLite.
+
+    Returns:
+        JSON object of the note, or None if not found
+    """
+    with _cursor() as cursor:
+        cursor.execute(_json_object_sql(_SQL_NOTE_BY_ID, NOTE_FIELDS), (note_id,))
         row = cursor.fetchone()
 
-        if row:
-            return {
-                "ZCREATIONDATE": row["ZCREATIONDATE"],
-                "ZMODIFICATIONDATE": row["ZMODIFICATIONDATE"],
-                "ZARCHIVED": row["ZARCHIVED"],
-                "ZSUBTITLE": row["ZSUBTITLE"],
-                "ZTEXT": row["ZTEXT"],
-                "ZTITLE": row["ZTITLE"],
-                "ZUNIQUEIDENTIFIER": row["ZUNIQUEIDENTIFIER"],
-            }
-        return None
-    finally:
-        conn.close()
+    if row:
+        return row[0]
+    return None
 
 
-def get_notes_by_tag(tag: str) -> list[dict[str, Any]]:
+def get_notes_by_tag(tag: str, limit: int | None = None) -> list[sqlite3.Row]:
     """
     Get all notes with a specific tag.
 
     Args:
         tag: Tag name (without # prefix)
+        limit: Maximum number of notes to return (None for all)
 
     Returns:
-        List of notes with the specified tag
+        List of non-archived, non-trashed notes with the specified tag
     """
-    db_path = get_bear_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    with _cursor() as cursor:
+        cursor.execute(*_notes_by_tag_query(tag, cursor, limit))
+        return cursor.fetchall()
 
-    try:
-        # Search for the tag in note text (Bear stores tags inline as #tag)
-        search_pattern = f"%#{tag}%"
-        cursor.execute(
-            """
-            SELECT * FROM ZSFNOTE
-            WHERE ZARCHIVED=0
-            AND ZTEXT LIKE ?;
-            """,
-            (search_pattern,)
-        )
-        rows = cursor.fetchall()
-
-        notes = []
-        for row in rows:
-            notes.append({
-                "ZCREATIONDATE": row["ZCREATIONDATE"],
-                "ZSUBTITLE": row["ZSUBTITLE"],
-                "ZTEXT": row["ZTEXT"],
-                "ZTITLE": row["ZTITLE"],
-                "ZUNIQUEIDENTIFIER": row["ZUNIQUEIDENTIFIER"],
-            })
-
-        return notes
-    finally:
-        conn.close()
+
+def get_notes_by_tag_json(tag: str, limit: int | None = None) -> tuple[str, int]:
+    """
+    Like get_notes_by_tag, but serialized to JSON by SQLite.
+
+    Returns:
+        Tuple of (JSON array of notes, number of notes)
+    """
+    with _cursor() as cursor:
+        sql, params = _notes_by_tag_query(tag, cursor, limit)
+        return _fetch_json_array(sql, params, _NOTE_LIST_FIELDS, cursor)
+
+
+def count_notes_by_tag(tag: str) -> int:
+    """Count the notes get_notes_by_tag would return, without fetching them."""
+    with _cursor() as cursor:
+        sql, params = _notes_by_tag_query(tag, cursor)
+        cursor.execute(_count_sql(sql), params)
+        return cursor.fetchone()[0]
 
 
-def get_archived_notes() -> list[dict[str, Any]]:
+def get_archived_notes(fields: Sequence[str] = DEFAULT_NOTE_FIELDS) -> list[sqlite3.Row]:
     """
     Retrieve all archived notes from Bear.
 
+    Args:
+        fields: Note columns to return (see NOTE_FIELDS)
+
     Returns:
-        List of archived notes
+        List of archived notes with the requested fields
     """
-    db_path = get_bear_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    sql = _projection_sql(_SQL_ARCHIVED_NOTES, _note_fields(fields))
+    with _cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchall()
 
-    try:
-        cursor.execute("SELECT * FROM ZSFNOTE WHERE ZARCHIVED=1;")
-        rows = cursor.fetchall()
-
-        notes = []
-        for row in rows:
-            notes.append({
-                "ZCREATIONDATE": row["ZCREATIONDATE"],
-                "ZSUBTITLE": row["ZSUBTITLE"],
-                "ZTEXT": row["ZTEXT"],
-                "ZTITLE": row["ZTITLE"],
-                "ZUNIQUEIDENTIFIER": row["ZUNIQUEIDENTIFIER"],
-            })
-
-        return notes
-    finally:
-        conn.close()
+
+def iter_archived_notes(fields: Sequence[str] = DEFAULT_NOTE_FIELDS) -> Iterator[sqlite3.Row]:
+    """
+    Like get_archived_notes, but yields notes as they are read.
+
+    Use this when scanning the archive, e.g. with any(), so the whole result
+    never has to be held in memory. The notes come from a snapshot taken when
+    iteration starts; other helpers are unaffected and see Bear's latest
+    changes. Exhaust or close() the iterator promptly, as the snapshot holds
+    back checkpointing of Bear's WAL file while it is open.
+
+    Raises:
+        ValueError: If unknown fields are requested (raised immediately)
+    """
+    sql = _projection_sql(_SQL_ARCHIVED_NOTES, _note_fields(fields))
+    return _iter_rows(sql)
+
+
+def get_archived_notes_json(fields: Sequence[str] = DEFAULT_NOTE_FIELDS) -> tuple[str, int]:
+    """
+    Like get_archived_notes, but serialized to JSON by SQLite.
+
+    Returns:
+        Tuple of (JSON array of notes, number of notes)
+    """
+    fields = _note_fields(fields)
+    sql = _projection_sql(_SQL_ARCHIVED_NOTES, fields)
+    with _cursor() as cursor:
+        return _fetch_json_array(sql, (), fields, cursor)
+
+
+def is_note_archived(note_id: str) -> bool:
+    """
+    Check whether a note is archived.
+
+    Args:
+        note_id: The unique identifier of the note (ZUNIQUEIDENTIFIER)
+
+    Returns:
+        True if the note exists and is archived
+    """
+    with _cursor() as cursor:
+        cursor.execute(_SQL_NOTE_ARCHIVED, (note_id,))
+        row = cursor.fetchone()
+
+    return bool(row and row[0])
+
+
+def count_archived_notes() -> int:
+    """Count archived notes without fetching them."""
+    with _cursor() as cursor:
+        cursor.execute(_SQL_COUNT_ARCHIVED_NOTES)
+        return cursor.fetchone()[0]
@@ -2,7 +2,12 @@
 """MCP Bear - Main server implementation."""
 
 import asyncio
+import functools
+import json
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from mcp.server import Server
@@ -14,12 +19,15 @@ from mcp.types import (
 )
 
 from .database import (
-    get_notes,
-    get_notes_like,
-    get_tags,
-    get_note_by_id,
-    get_notes_by_tag,
-    get_archived_notes,
+    NOTE_FIELDS,
+    DEFAULT_NOTE_FIELDS,
+    get_bear_db_path,
+    get_notes_json,
+    get_notes_like_json,
+    get_tags_json,
+    get_note_by_id_json,
+    get_notes_by_tag_json,
+    get_archived_notes_json,
 )
 from .bear_url import (
     create_note,
@@ -32,6 +40,7 @@ from .bear_url import (
     unarchive_note,
     open_tag,
     rename_tag,
+    write_generation,
 )
 
 # Configure logging
@@ -41,393 +50,642 @@ logger = logging.getLogger(__name__)
 # Create server instance
 app = Server("mcp-bear")
 
-
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available MCP tools."""
-    return [
-        Tool(
-            name="get_notes",
-            description="Get all notes from Bear",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-            },
+# sqlite3 and subprocess calls block, so tools run them off the event loop:
+# Bear URL commands via asyncio.to_thread, and database queries on a dedicated
+# thread. All queries share one connection guarded by a lock, so additional
+# database threads would only queue behind it.
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-bear-db")
+
+
+async def _query(func: Any, *args: Any, **kwargs: Any) -> Any:
+    """Run a database helper on the database thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(func, *args, **kwargs))
+
+
+# Results of read-only tools are cached for a short time. An entry is only
+# reused while no write has been sent through bear_url and Bear's database
+# files are unchanged on disk, so edits made in Bear itself are picked up too.
+_CACHE_TTL = 30.0
+_CACHE_MAX_ENTRIES = 128
+_CACHEABLE_TOOLS = frozenset({
+    "get_notes",
+    "get_tags",
+    "get_notes_like",
+    "get_note_by_id",
+    "get_notes_by_tag",
+    "get_archived_notes",
+})
+_result_cache: dict[tuple[str, str], tuple[float, tuple[int, ...], list[TextContent]]] = {}
+
+
+def _dumps(payload: Any) -> str:
+    """Serialize a tool result as compact JSON."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+# Bear runs in WAL mode, so commits touch the -wal file before the main file
+# is checkpointed.
+_DB_FILES = (get_bear_db_path(), get_bear_db_path() + "-wal")
+
+
+def _cache_state() -> tuple[int, ...]:
+    """Return a fingerprint of everything that invalidates cached results."""
+    state = [write_generation()]
+    for path in _DB_FILES:
+        try:
+            state.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            state.append(0)
+    return tuple(state)
+
+
+def _cache_get(key: tuple[str, str], state: tuple[int, ...]) -> list[TextContent] | None:
+    """Return a cached result if it is still fresh."""
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    expires, entry_state, result = entry
+    if expires < time.monotonic() or entry_state != state:
+        del _result_cache[key]
+        return None
+    return result
+
+
+def _cache_put(key: tuple[str, str], state: tuple[int, ...], result: list[TextContent]) -> None:
+    """Store a result, evicting the oldest entry when the cache is full."""
+    if len(_result_cache) >= _CACHE_MAX_ENTRIES:
+        del _result_cache[next(iter(_result_cache))]
+    _result_cache[key] = (time.monotonic() + _CACHE_TTL, state, result)
+
+
+# Schema for the optional "fields" projection of the note listing tools
+_NOTE_FIELDS_SCHEMA = {
+    "type": "array",
+    "items": {"type": "string", "enum": list(NOTE_FIELDS)},
+    "description": "Note fields to return (ZTEXT is the full note body)",
+    "default": list(DEFAULT_NOTE_FIELDS),
+}
+
+
+# The tool list never changes, so it is built once at import instead of per
+# request. It is a tuple so callers cannot alter it; tools added at runtime
+# would need it rebuilt.
+_TOOLS = (
+    Tool(
+        name="get_notes",
+        description=(
+            "Get all notes from Bear. Returns titles and identifiers only "
+            "unless more fields are requested; use get_note_by_id to read a note"
         ),
-        Tool(
-            name="get_tags",
-            description="Get all note tags. You can search notes by tags with get_notes_like",
-            inputSchema={
-                "type": "object",
-                "properties": {},
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fields": _NOTE_FIELDS_SCHEMA,
             },
-        ),
-        Tool(
-            name="get_notes_like",
-            description="Get notes that include a specific text string",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "like": {
-                        "type": "string",
-                        "description": "Find notes that have this text",
-                    },
+        },
+    ),
+    Tool(
+        name="get_tags",
+        description="Get all note tags. You can search notes by tags with get_notes_like",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+    Tool(
+        name="get_notes_like",
+        description="Get notes that include a specific text string",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "like": {
+                    "type": "string",
+                    "description": "Find notes that have this text",
+                },
+                "include_text": {
+                    "type": "boolean",
+                    "description": "Also return each note's full text (ZTEXT)",
+                    "default": False,
                 },
-                "required": ["like"],
             },
-        ),
-        Tool(
-            name="create_note",
-            description="Create a new note in Bear",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "title": {
-                        "type": "string",
-                        "description": "Note title",
-                    },
-                    "text": {
-                        "type": "string",
-                        "description": "Note content (supports Markdown)",
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of tags to add (without # prefix)",
-                    },
-                    "pin": {
-                        "type": "boolean",
-                        "description": "Pin the note to the top",
-                        "default": False,
-                    },
-                    "open_note": {
-                        "type": "boolean",
-                        "description": "Open the note in Bear after creation",
-                        "default": False,
-                    },
+            "required": ["like"],
+        },
+    ),
+    Tool(
+        name="create_note",
+        description="Create a new note in Bear",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "string",
+                    "description": "Note title",
+                },
+                "text": {
+                    "type": "string",
+                    "description": "Note content (supports Markdown)",
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of tags to add (without # prefix)",
+                },
+                "pin": {
+                    "type": "boolean",
+                    "description": "Pin the note to the top",
+                    "default": False,
+                },
+                "open_note": {
+                    "type": "boolean",
+                    "description": "Open the note in Bear after creation",
+                    "default": False,
                 },
             },
-        ),
-        Tool(
-            name="add_text",
-            description="Add text to an existing note",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "note_id": {
-                        "type": "string",
-                        "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
-                    },
-                    "text": {
-                        "type": "string",
-                        "description": "Text to add",
-                    },
-                    "mode": {
-                        "type": "string",
-                        "enum": ["append", "prepend", "replace"],
-                        "description": "Where to add text",
-                        "default": "append",
-                    },
-                    "open_note": {
-                        "type": "boolean",
-                        "description": "Open the note in Bear after modification",
-                        "default": False,
-                    },
+        },
+    ),
+    Tool(
+        name="add_text",
+        description="Add text to an existing note",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
+                },
+                "text": {
+                    "type": "string",
+                    "description": "Text to add",
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": ["append", "prepend", "replace"],
+                    "description": "Where to add text",
+                    "default": "append",
+                },
+                "open_note": {
+                    "type": "boolean",
+                    "description": "Open the note in Bear after modification",
+                    "default": False,
                 },
-                "required": ["note_id", "text"],
             },
+            "required": ["note_id", "text"],
+        },
+    ),
+    Tool(
+        name="update_note",
+        description=(
+            "Add text and/or tags to an existing note in a single Bear call. "
+            "Prefer this over separate add_text and add_tags calls"
         ),
-        Tool(
-            name="add_tags",
-            description="Add tags to an existing note",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "note_id": {
-                        "type": "string",
-                        "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of tags to add (without # prefix)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
+                },
+                "text": {
+                    "type": "string",
+                    "description": "Text to add",
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": ["append", "prepend", "replace"],
+                    "description": "Where to add text",
+                    "default": "append",
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of tags to add (without # prefix)",
+                },
+                "open_note": {
+                    "type": "boolean",
+                    "description": "Open the note in Bear after modification",
+                    "default": False,
                 },
-                "required": ["note_id", "tags"],
             },
-        ),
-        Tool(
-            name="trash_note",
-            description="Move a note to trash",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "note_id": {
-                        "type": "string",
-                        "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
-                    },
+            "required": ["note_id"],
+        },
+    ),
+    Tool(
+        name="add_tags",
+        description="Add tags to an existing note",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of tags to add (without # prefix)",
                 },
-                "required": ["note_id"],
             },
-        ),
-        Tool(
-            name="open_note",
-            description="Open a specific note in Bear",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "note_id": {
-                        "type": "string",
-                        "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
-                    },
+            "required": ["note_id", "tags"],
+        },
+    ),
+    Tool(
+        name="trash_note",
+        description="Move a note to trash",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
                 },
-                "required": ["note_id"],
             },
-        ),
-        Tool(
-            name="search_bear",
-            description="Open Bear and show search results for a term",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "term": {
-                        "type": "string",
-                        "description": "Search term",
-                    },
+            "required": ["note_id"],
+        },
+    ),
+    Tool(
+        name="open_note",
+        description="Open a specific note in Bear",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
                 },
-                "required": ["term"],
             },
-        ),
-        Tool(
-            name="get_note_by_id",
-            description="Get a specific note by its unique identifier",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "note_id": {
-                        "type": "string",
-                        "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
-                    },
+            "required": ["note_id"],
+        },
+    ),
+    Tool(
+        name="search_bear",
+        description="Open Bear and show search results for a term",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "term": {
+                    "type": "string",
+                    "description": "Search term",
                 },
-                "required": ["note_id"],
             },
-        ),
-        Tool(
-            name="get_notes_by_tag",
-            description="Get all notes with a specific tag",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "tag": {
-                        "type": "string",
-                        "description": "Tag name (without # prefix)",
-                    },
+            "required": ["term"],
+        },
+    ),
+    Tool(
+        name="get_note_by_id",
+        description="Get a specific note by its unique identifier",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
                 },
-                "required": ["tag"],
             },
-        ),
-        Tool(
-            name="get_archived_notes",
-            description="Get all archived notes",
-            inputSchema={
-                "type": "object",
-                "properties": {},
+            "required": ["note_id"],
+        },
+    ),
+    Tool(
+        name="get_notes_by_tag",
+        description="Get all notes with a specific tag",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tag": {
+                    "type": "string",
+                    "description": "Tag name (without # prefix)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maximum number of notes to return",
+                },
             },
+            "required": ["tag"],
+        },
+    ),
+    Tool(
+        name="get_archived_notes",
+        description=(
+            "Get all archived notes. Returns titles and identifiers only "
+            "unless more fields are requested"
         ),
-        Tool(
-            name="archive_note",
-            description="Archive a note",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "note_id": {
-                        "type": "string",
-                        "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fields": _NOTE_FIELDS_SCHEMA,
+            },
+        },
+    ),
+    Tool(
+        name="archive_note",
+        description="Archive a note",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
                 },
-                "required": ["note_id"],
             },
-        ),
-        Tool(
-            name="unarchive_note",
-            description="Unarchive a note",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "note_id": {
-                        "type": "string",
-                        "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
-                    },
+            "required": ["note_id"],
+        },
+    ),
+    Tool(
+        name="unarchive_note",
+        description="Unarchive a note",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "string",
+                    "description": "The unique identifier of the note (ZUNIQUEIDENTIFIER)",
                 },
-                "required": ["note_id"],
             },
-        ),
-        Tool(
-            name="open_tag",
-            description="Open Bear and show all notes with a specific tag",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "tag": {
-                        "type": "string",
-                        "description": "Tag name (without # prefix)",
-                    },
+            "required": ["note_id"],
+        },
+    ),
+    Tool(
+        name="open_tag",
+        description="Open Bear and show all notes with a specific tag",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tag": {
+                    "type": "string",
+                    "description": "Tag name (without # prefix)",
                 },
-                "required": ["tag"],
             },
-        ),
-        Tool(
-            name="rename_tag",
-            description="Rename a tag across all notes",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "old_tag": {
-                        "type": "string",
-                        "description": "Current tag name (without # prefix)",
-                    },
-                    "new_tag": {
-                        "type": "string",
-                        "description": "New tag name (without # prefix)",
-                    },
+            "required": ["tag"],
+        },
+    ),
+    Tool(
+        name="rename_tag",
+        description="Rename a tag across all notes",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "old_tag": {
+                    "type": "string",
+                    "description": "Current tag name (without # prefix)",
+                },
+                "new_tag": {
+                    "type": "string",
+                    "description": "New tag name (without # prefix)",
                 },
-                "required": ["old_tag", "new_tag"],
             },
-        ),
-    ]
+            "required": ["old_tag", "new_tag"],
+        },
+    ),
+)
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available MCP tools."""
+    return list(_TOOLS)
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls."""
     try:
-        if name == "get_notes":
-            notes = get_notes()
-            return [TextContent(type="text", text=str({"notes": notes}))]
-
-        elif name == "get_tags":
-            tags = get_tags()
-            return [TextContent(type="text", text=str({"tags": tags}))]
-
-        elif name == "get_notes_like":
-            if not isinstance(arguments, dict) or "like" not in arguments:
-                raise ValueError("Missing required argument: like")
-
-            search_text = arguments["like"]
-            notes = get_notes_like(search_text)
-            return [TextContent(type="text", text=str({"notes": notes}))]
-
-        elif name == "create_note":
-            if not isinstance(arguments, dict):
-                raise ValueError("Invalid arguments")
-
-            result = create_note(
-                title=arguments.get("title"),
-                text=arguments.get("text"),
-                tags=arguments.get("tags"),
-                pin=arguments.get("pin", False),
-                open_note=arguments.get("open_note", False)
-            )
-            return [TextContent(type="text", text=str(result))]
-
-        elif name == "add_text":
-            if not isinstance(arguments, dict) or "note_id" not in arguments or "text" not in arguments:
-                raise ValueError("Missing required arguments: note_id and text")
-
-            result = add_text(
-                note_id=arguments["note_id"],
-                text=arguments["text"],
-                mode=arguments.get("mode", "append"),
-                open_note=arguments.get("open_note", False)
-            )
-            return [TextContent(type="text", text=str(result))]
-
-        elif name == "add_tags":
-            if not isinstance(arguments, dict) or "note_id" not in arguments or "tags" not in arguments:
-                raise ValueError("Missing required arguments: note_id and tags")
-
-            result = add_tags_to_note(
-                note_id=arguments["note_id"],
-                tags=arguments["tags"]
-            )
-            return [TextContent(type="text", text=str(result))]
-
-        elif name == "trash_note":
-            if not isinstance(arguments, dict) or "note_id" not in arguments:
-                raise ValueError("Missing required argument: note_id")
-
-            result = trash_note(note_id=arguments["note_id"])
-            return [TextContent(type="text", text=str(result))]
-
-        elif name == "open_note":
-            if not isinstance(arguments, dict) or "note_id" not in arguments:
-                raise ValueError("Missing required argument: note_id")
-
-            result = open_note(note_id=arguments["note_id"])
-            return [TextContent(type="text", text=str(result))]
-
-        elif name == "search_bear":
-            if not isinstance(arguments, dict) or "term" not in arguments:
-                raise ValueError("Missing required argument: term")
-
-            result = search_in_bear(term=arguments["term"])
-            return [TextContent(type="text", text=str(result))]
-
-        elif name == "get_note_by_id":
-            if not isinstance(arguments, dict) or "note_id" not in arguments:
-                raise ValueError("Missing required argument: note_id")
-
-            note = get_note_by_id(note_id=arguments["note_id"])
-            if note:
-                return [TextContent(type="text", text=str({"note": note}))]
-            else:
-                return [TextContent(type="text", text=str({"error": "Note not found"}))]
-
-        elif name == "get_notes_by_tag":
-            if not isinstance(arguments, dict) or "tag" not in arguments:
-                raise ValueError("Missing required argument: tag")
-
-            notes = get_notes_by_tag(tag=arguments["tag"])
-            return [TextContent(type="text", text=str({"notes": notes, "count": len(notes)}))]
-
-        elif name == "get_archived_notes":
-            notes = get_archived_notes()
-            return [TextContent(type="text", text=str({"notes": notes, "count": len(notes)}))]
-
-        elif name == "archive_note":
-            if not isinstance(arguments, dict) or "note_id" not in arguments:
-                raise ValueError("Missing required argument: note_id")
-
-            result = archive_note(note_id=arguments["note_id"])
-            return [TextContent(type="text", text=str(result))]
-
-        elif name == "unarchive_note":
-            if not isinstance(arguments, dict) or "note_id" not in arguments:
-                raise ValueError("Missing required argument: note_id")
+        if name not in _CACHEABLE_TOOLS:
+            return await _run_tool(name, arguments)
 
-            result = unarchive_note(note_id=arguments["note_id"])
-            return [TextContent(type="text", text=str(result))]
+        key = (name, json.dumps(arguments, sort_keys=True, default=str))
+        state = _cache_state()
+        result = _cache_get(key, state)
+        if result is None:
+            result = await _run_tool(name, arguments)
+            _cache_put(key, state, result)
+        return result
 
-        elif name == "open_tag":
-            if not isinstance(arguments, dict) or "tag" not in arguments:
-                raise ValueError("Missing required argument: tag")
+    except Exception as e:
+        logger.error(f"Error executing tool {name}: {e}", exc_info=True)
+        return [TextContent(type="text", text=f"Error: {str(e)}")]
 
-            result = open_tag(tag=arguments["tag"])
-            return [TextContent(type="text", text=str(result))]
 
-        elif name == "rename_tag":
-            if not isinstance(arguments, dict) or "old_tag" not in arguments or "new_tag" not in arguments:
-                raise ValueError("Missing required arguments: old_tag and new_tag")
+# The get_* handlers take their payload pre-serialized from SQLite's json1
+# functions, so note rows never become Python objects; only the envelope is
+# added here.
+async def _handle_get_notes(arguments: Any) -> list[TextContent]:
+    """List non-archived notes."""
+    fields = arguments.get("fields") if isinstance(arguments, dict) else None
+    notes_json, _ = await _query(get_notes_json, fields=fields or DEFAULT_NOTE_FIELDS)
+    return [TextContent(type="text", text=f'{{"notes":{notes_json}}}')]
+
+
+async def _handle_get_tags(arguments: Any) -> list[TextContent]:
+    """List all tags."""
+    tags_json = await _query(get_tags_json)
+    return [TextContent(type="text", text=f'{{"tags":{tags_json}}}')]
+
+
+async def _handle_get_notes_like(arguments: Any) -> list[TextContent]:
+    """Search notes by text."""
+    if not isinstance(arguments, dict) or "like" not in arguments:
+        raise ValueError("Missing required argument: like")
+
+    search_text = arguments["like"]
+    include_text = arguments.get("include_text", False)
+    notes_json, _ = await _query(get_notes_like_json, search_text, include_text=include_text)
+    return [TextContent(type="text", text=f'{{"notes":{notes_json}}}')]
+
+
+async def _handle_create_note(arguments: Any) -> list[TextContent]:
+    """Create a note."""
+    if not isinstance(arguments, dict):
+        raise ValueError("Invalid arguments")
+
+    result = await asyncio.to_thread(
+        create_note,
+        title=arguments.get("title"),
+        text=arguments.get("text"),
+        tags=arguments.get("tags"),
+        pin=arguments.get("pin", False),
+        open_note=arguments.get("open_note", False)
+    )
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_add_text(arguments: Any) -> list[TextContent]:
+    """Add text to a note."""
+    if not isinstance(arguments, dict) or "note_id" not in arguments or "text" not in arguments:
+        raise ValueError("Missing required arguments: note_id and text")
+
+    result = await asyncio.to_thread(
+        add_text,
+        note_id=arguments["note_id"],
+        text=arguments["text"],
+        mode=arguments.get("mode", "append"),
+        open_note=arguments.get("open_note", False)
+    )
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_update_note(arguments: Any) -> list[TextContent]:
+    """Add text and/or tags to a note in one call."""
+    if not isinstance(arguments, dict) or "note_id" not in arguments:
+        raise ValueError("Missing required argument: note_id")
+    if "text" not in arguments and not arguments.get("tags"):
+        raise ValueError("Provide text, tags, or both")
+
+    if "text" in arguments:
+        # Text and tags travel in one /add-text URL
+        result = await asyncio.to_thread(
+            add_text,
+            note_id=arguments["note_id"],
+            text=arguments["text"],
+            mode=arguments.get("mode", "append"),
+            open_note=arguments.get("open_note", False),
+            tags=arguments.get("tags")
+        )
+    else:
+        result = await asyncio.to_thread(
+            add_tags_to_note,
+            note_id=arguments["note_id"],
+            tags=arguments["tags"]
+        )
+        if result["success"] and arguments.get("open_note", False):
+            result = await asyncio.to_thread(open_note, note_id=arguments["note_id"])
+    return [TextContent(type="text", text=_dumps(result))]
 
-            result = rename_tag(old_tag=arguments["old_tag"], new_tag=arguments["new_tag"])
-            return [TextContent(type="text", text=str(result))]
-
-        else:
-            raise ValueError(f"Unknown tool: {name}")
 
-    except Exception as e:
-        logger.error(f"Error executing tool {name}: {e}", exc_info=True)
-        return [TextContent(type="text", text=f"Error: {str(e)}")]
+async def _handle_add_tags(arguments: Any) -> list[TextContent]:
+    """Add tags to a note."""
+    if not isinstance(arguments, dict) or "note_id" not in arguments or "tags" not in arguments:
+        raise ValueError("Missing required arguments: note_id and tags")
+
+    result = await asyncio.to_thread(
+        add_tags_to_note,
+        note_id=arguments["note_id"],
+        tags=arguments["tags"]
+    )
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_trash_note(arguments: Any) -> list[TextContent]:
+    """Move a note to trash."""
+    if not isinstance(arguments, dict) or "note_id" not in arguments:
+        raise ValueError("Missing required argument: note_id")
+
+    result = await asyncio.to_thread(trash_note, note_id=arguments["note_id"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_open_note(arguments: Any) -> list[TextContent]:
+    """Open a note in Bear."""
+    if not isinstance(arguments, dict) or "note_id" not in arguments:
+        raise ValueError("Missing required argument: note_id")
+
+    result = await asyncio.to_thread(open_note, note_id=arguments["note_id"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_search_bear(arguments: Any) -> list[TextContent]:
+    """Show search results in Bear."""
+    if not isinstance(arguments, dict) or "term" not in arguments:
+        raise ValueError("Missing required argument: term")
+
+    result = await asyncio.to_thread(search_in_bear, term=arguments["term"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_get_note_by_id(arguments: Any) -> list[TextContent]:
+    """Fetch a note by identifier."""
+    if not isinstance(arguments, dict) or "note_id" not in arguments:
+        raise ValueError("Missing required argument: note_id")
+
+    note_json = await _query(get_note_by_id_json, note_id=arguments["note_id"])
+    if note_json:
+        return [TextContent(type="text", text=f'{{"note":{note_json}}}')]
+    else:
+        return [TextContent(type="text", text=_dumps({"error": "Note not found"}))]
+
+
+async def _handle_get_notes_by_tag(arguments: Any) -> list[TextContent]:
+    """List notes with a tag."""
+    if not isinstance(arguments, dict) or "tag" not in arguments:
+        raise ValueError("Missing required argument: tag")
+
+    notes_json, count = await _query(
+        get_notes_by_tag_json, tag=arguments["tag"], limit=arguments.get("limit")
+    )
+    return [TextContent(type="text", text=f'{{"notes":{notes_json},"count":{count}}}')]
+
+
+async def _handle_get_archived_notes(arguments: Any) -> list[TextContent]:
+    """List archived notes."""
+    fields = arguments.get("fields") if isinstance(arguments, dict) else None
+    notes_json, count = await _query(get_archived_notes_json, fields=fields or DEFAULT_NOTE_FIELDS)
+    return [TextContent(type="text", text=f'{{"notes":{notes_json},"count":{count}}}')]
+
+
+async def _handle_archive_note(arguments: Any) -> list[TextContent]:
+    """Archive a note."""
+    if not isinstance(arguments, dict) or "note_id" not in arguments:
+        raise ValueError("Missing required argument: note_id")
+
+    result = await asyncio.to_thread(archive_note, note_id=arguments["note_id"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_unarchive_note(arguments: Any) -> list[TextContent]:
+    """Unarchive a note."""
+    if not isinstance(arguments, dict) or "note_id" not in arguments:
+        raise ValueError("Missing required argument: note_id")
+
+    result = await asyncio.to_thread(unarchive_note, note_id=arguments["note_id"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_open_tag(arguments: Any) -> list[TextContent]:
+    """Show a tag's notes in Bear."""
+    if not isinstance(arguments, dict) or "tag" not in arguments:
+        raise ValueError("Missing required argument: tag")
+
+    result = await asyncio.to_thread(open_tag, tag=arguments["tag"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_rename_tag(arguments: Any) -> list[TextContent]:
+    """Rename a tag."""
+    if not isinstance(arguments, dict) or "old_tag" not in arguments or "new_tag" not in arguments:
+        raise ValueError("Missing required arguments: old_tag and new_tag")
+
+    result = await asyncio.to_thread(rename_tag, old_tag=arguments["old_tag"], new_tag=arguments["new_tag"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+# Tool name -> handler. Handlers raise on invalid arguments or failures.
+_TOOL_HANDLERS = {
+    "get_notes": _handle_get_notes,
+    "get_tags": _handle_get_tags,
+    "get_notes_like": _handle_get_notes_like,
+    "create_note": _handle_create_note,
+    "add_text": _handle_add_text,
+    "update_note": _handle_update_note,
+    "add_tags": _handle_add_tags,
+    "trash_note": _handle_trash_note,
+    "open_note": _handle_open_note,
+    "search_bear": _handle_search_bear,
+    "get_note_by_id": _handle_get_note_by_id,
+    "get_notes_by_tag": _handle_get_notes_by_tag,
+    "get_archived_notes": _handle_get_archived_notes,
+    "archive_note": _handle_archive_note,
+    "unarchive_note": _handle_unarchive_note,
+    "open_tag": _handle_open_tag,
+    "rename_tag": _handle_rename_tag,
+}
+
+
+async def _run_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Execute a tool, raising on invalid arguments or failures."""
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments)
 
 
 async def run_server():
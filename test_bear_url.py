@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Test Bear URL dispatch through the 'open' fallback, with a stub 'open'.
+
+Needs no Bear installation:
+
+    pytest test_bear_url.py
+"""
+
+import gc
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+from mcp_bear import bear_url
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs a POSIX shell")
+
+
+@pytest.fixture
+def stub_open(tmp_path, monkeypatch):
+    """Put a failing 'open' first on PATH and disable the pyobjc path."""
+    script = tmp_path / "open"
+    script.write_text('#!/bin/sh\necho "No application knows how to open URL $1" >&2\nexit 1\n')
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(bear_url, "_launch_services", lambda: None)
+
+
+def wait_for_warning(caplog, timeout=3.0):
+    """Wait for the background reaper to log a warning."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if caplog.records:
+            return caplog.records[0]
+        time.sleep(0.01)
+    return None
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_failed_open_is_reaped_and_logged(stub_open, caplog):
+    caplog.set_level(logging.WARNING, logger=bear_url.__name__)
+
+    result = bear_url.archive_note("NOTE-1")
+
+    # Dispatch does not wait for 'open'; its failure shows up in the log
+    assert result["success"]
+    record = wait_for_warning(caplog)
+    assert record is not None
+    assert "status 1" in record.getMessage()
+    assert "No application knows how to open URL" in record.getMessage()
+    # Dropping the Popen object must not warn about a still-running child
+    gc.collect()
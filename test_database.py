@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Test the database helpers against a generated Bear-like database.
+
+Needs no Bear installation:
+
+    pytest test_database.py
+"""
+
+import sqlite3
+
+import pytest
+
+from mcp_bear import database
+
+SCHEMA = """
+    CREATE TABLE ZSFNOTE (
+        Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER,
+        ZARCHIVED INTEGER, ZTRASHED INTEGER,
+        ZCREATIONDATE TIMESTAMP, ZMODIFICATIONDATE TIMESTAMP,
+        ZSUBTITLE VARCHAR, ZTEXT VARCHAR, ZTITLE VARCHAR, ZUNIQUEIDENTIFIER VARCHAR
+    );
+    CREATE TABLE ZSFNOTETAG (Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER, ZTITLE VARCHAR);
+"""
+
+
+@pytest.fixture
+def bear_db(tmp_path, monkeypatch):
+    """Point the database module at a fresh Bear-like database.
+
+    Yields a writable connection standing in for Bear itself.
+    """
+    path = tmp_path / "database.sqlite"
+    bear = sqlite3.connect(path, isolation_level=None)
+    bear.execute("PRAGMA journal_mode=WAL;")
+    bear.executescript(SCHEMA)
+
+    database._close_conn()
+    monkeypatch.setattr(database, "_DB_PATH", str(path))
+    monkeypatch.setattr(database, "_sql_notes_by_tag_join", None)
+    monkeypatch.setattr(database, "_fts_available", None)
+    monkeypatch.setattr(database, "_fts_data_version", None)
+    yield bear
+    database._close_conn()
+    bear.close()
+
+
+def add_note(bear, pk, title, text, modified=700000000.0, archived=0):
+    """Insert a note the way Bear's Core Data store would."""
+    bear.execute(
+        "INSERT INTO ZSFNOTE VALUES (?, 5, 1, ?, 0, ?, ?, ?, ?, ?, ?)",
+        (pk, archived, modified, modified, text[:20], text, title, f"UUID-{pk}"),
+    )
+
+
+def save_note_text(bear, pk, text):
+    """Change a note's body without touching its dates, bumping Z_OPT as Core Data does."""
+    bear.execute("UPDATE ZSFNOTE SET ZTEXT=?, Z_OPT=Z_OPT+1 WHERE Z_PK=?", (text, pk))
+
+
+def titles(notes):
+    return sorted(note["ZTITLE"] for note in notes)
+
+
+@pytest.fixture
+def fts_db(bear_db):
+    """A database whose searches go through the temp FTS index."""
+    add_note(bear_db, 1, "First", "alpha body")
+    add_note(bear_db, 2, "Second", "beta body", modified=800000000.0)
+    assert titles(database.get_notes_like("alpha")) == ["First"]
+    if not database._fts_available:
+        pytest.skip("SQLite lacks the FTS5 trigram tokenizer")
+    return bear_db
+
+
+def test_search_finds_note_with_older_modification_date(fts_db):
+    # e.g. a note synced from another device after the last search
+    add_note(fts_db, 3, "Synced", "xyzzy from elsewhere", modified=600000000.0)
+    assert titles(database.get_notes_like("xyzzy")) == ["Synced"]
+
+
+def test_search_sees_edit_that_keeps_the_modification_date(fts_db):
+    save_note_text(fts_db, 1, "gamma body")
+    assert database.get_notes_like("alpha") == []
+    assert titles(database.get_notes_like("gamma")) == ["First"]
+
+
+def test_search_drops_deleted_notes(fts_db):
+    fts_db.execute("DELETE FROM ZSFNOTE WHERE Z_PK=2")
+    assert database.get_notes_like("beta") == []
+    assert titles(database.get_notes_like("body")) == ["First"]
+
+
+def test_search_matches_like_scan(fts_db):
+    add_note(fts_db, 3, "Third", "Café crème, 100% sure", modified=1.0)
+    for text in ("body", "CAFÉ", "100%", "cr", "e_c", "missing"):
+        pattern = f"%{text}%"
+        expected = fts_db.execute(
+            "SELECT ZTITLE FROM ZSFNOTE WHERE ZARCHIVED=0 AND (ZTEXT LIKE ? OR ZTITLE LIKE ?)",
+            (pattern, pattern),
+        ).fetchall()
+        assert titles(database.get_notes_like(text)) == sorted(title for (title,) in expected)
+
+
+def add_tagged_notes(bear):
+    """Notes A and B tagged #work, with only B also pinned in that tag."""
+    add_note(bear, 1, "A", "first #work")
+    add_note(bear, 2, "B", "second #work")
+    bear.execute("INSERT INTO ZSFNOTETAG VALUES (1, 13, 1, 'work')")
+    # Created first, so sqlite_master lists it before the real join table
+    bear.execute("CREATE TABLE Z_5PINNEDINTAGS (Z_5PINNEDNOTES INTEGER, Z_13PINNEDINTAGS INTEGER)")
+    bear.execute("INSERT INTO Z_5PINNEDINTAGS VALUES (2, 1)")
+
+
+def test_notes_by_tag_ignores_pinned_join_table(bear_db):
+    add_tagged_notes(bear_db)
+    bear_db.execute("CREATE TABLE Z_5TAGS (Z_5NOTES INTEGER, Z_13TAGS INTEGER)")
+    bear_db.execute("INSERT INTO Z_5TAGS VALUES (1, 1), (2, 1)")
+
+    assert titles(database.get_notes_by_tag("work")) == ["A", "B"]
+    assert database.count_notes_by_tag("work") == 2
+    assert "Z_5TAGS" in database._sql_notes_by_tag_join
+
+
+def test_notes_by_tag_falls_back_to_text_when_join_table_is_ambiguous(bear_db):
+    add_tagged_notes(bear_db)
+    bear_db.execute("CREATE TABLE Z_5TAGS (Z_5NOTES INTEGER, Z_13TAGS INTEGER)")
+    bear_db.execute("CREATE TABLE Z_7TAGS (Z_7NOTES INTEGER, Z_13TAGS INTEGER)")
+
+    assert titles(database.get_notes_by_tag("work")) == ["A", "B"]
+    assert database._sql_notes_by_tag_join == ""
+
+
+def test_archive_iterator_does_not_freeze_other_queries(bear_db):
+    # More notes than one fetched chunk, so the SELECT is still unfinished
+    count = database._ITER_CHUNK_SIZE + 10
+    for pk in range(1, count + 1):
+        add_note(bear_db, pk, f"Note {pk}", "old text", archived=1)
+    notes = database.iter_archived_notes(["ZUNIQUEIDENTIFIER"])
+    assert next(notes)["ZUNIQUEIDENTIFIER"] == "UUID-1"
+
+    save_note_text(bear_db, 1, "new text")
+    assert database.get_note_by_id("UUID-1")["ZTEXT"] == "new text"
+    assert sum(1 for _ in notes) == count - 1
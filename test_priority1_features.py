@@ -1,123 +1,114 @@
 #!/usr/bin/env python3
-"""Test Priority 1 features: Archive, Tag Management, and Advanced Search."""
+"""Test Priority 1 features: Archive, Tag Management, and Advanced Search.
 
+Runs against a live Bear installation:
+
+    pytest test_priority1_features.py
+
+One test note is created for the whole session and archived when it ends,
+so every test below reuses it instead of creating its own. The tests are
+skipped when Bear's database cannot be found.
+"""
+
+import os
 import time
+
+import pytest
+
 from mcp_bear.bear_url import (
     create_note,
     archive_note,
     unarchive_note,
     open_tag,
     rename_tag,
+    batched,
 )
 from mcp_bear.database import (
+    get_bear_db_path,
     get_notes_like,
-    get_note_by_id,
-    get_notes_by_tag,
-    get_archived_notes,
+    count_notes_by_tag,
+    is_note_archived,
+    count_archived_notes,
 )
 
-print("=" * 70)
-print("Testing MCP Bear Priority 1 Features")
-print("=" * 70)
-print()
-
-# Test 1: Create a test note with tags
-print("Test 1: Creating test note with tags...")
-result = create_note(
-    title="Priority 1 Test Note",
-    text="Testing advanced features.\n\n#priority1 #testing #mcp",
-    tags=["priority1", "testing", "mcp"],
-    open_note=False
-)
-print(f"Result: {result}")
-print()
-
-time.sleep(2)
-
-# Test 2: Search for the note
-print("Test 2: Searching for the test note...")
-notes = get_notes_like("Priority 1 Test Note")
-if notes:
-    test_note = notes[0]
-    note_id = test_note["ZUNIQUEIDENTIFIER"]
-    print(f"✓ Found note! ID: {note_id}")
-    print(f"  Title: {test_note['ZTITLE']}")
-    print()
-
-    # Test 3: Get note by ID
-    print("Test 3: Getting note by ID...")
-    note_detail = get_note_by_id(note_id)
-    if note_detail:
-        print(f"✓ Retrieved note successfully")
-        print(f"  Created: {note_detail['ZCREATIONDATE']}")
-        print(f"  Modified: {note_detail['ZMODIFICATIONDATE']}")
-        print(f"  Archived: {note_detail['ZARCHIVED']}")
-    print()
+if not os.path.exists(get_bear_db_path()):
+    pytest.skip("Bear database not found", allow_module_level=True)
+
+TEST_NOTE_TITLE = "Priority 1 Test Note"
+
+
+def wait_until(predicate, timeout=3.0, interval=0.05):
+    """Poll predicate until it returns True or timeout seconds pass."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+@pytest.fixture(scope="session")
+def priority1_note():
+    """Create the shared test note (Test 1) and archive it afterwards."""
+    result = create_note(
+        title=TEST_NOTE_TITLE,
+        text="Testing advanced features.\n\n#priority1 #testing #mcp",
+        tags=["priority1", "testing", "mcp"],
+        open_note=False
+    )
+    assert result["success"], result
+
+    # Wait for Bear to commit the new note
+    if not wait_until(lambda: bool(get_notes_like(TEST_NOTE_TITLE))):
+        pytest.fail("Could not find test note. Make sure Bear is running!")
 
+    note = get_notes_like(TEST_NOTE_TITLE)[0]
+    yield note
+    archive_note(note["ZUNIQUEIDENTIFIER"])
+
+
+def test_find_note(priority1_note):
+    # Test 2: Search for the note
+    assert priority1_note["ZTITLE"] == TEST_NOTE_TITLE
+    assert priority1_note["ZUNIQUEIDENTIFIER"]
+
+
+def test_note_details(priority1_note):
+    # Test 3: Note details (search results already carry every field)
+    assert priority1_note["ZCREATIONDATE"] is not None
+    assert priority1_note["ZMODIFICATIONDATE"] is not None
+    assert not priority1_note["ZARCHIVED"]
+
+
+def test_notes_by_tag(priority1_note):
     # Test 4: Get notes by tag
-    print("Test 4: Getting all notes with #testing tag...")
-    tagged_notes = get_notes_by_tag("testing")
-    print(f"✓ Found {len(tagged_notes)} notes with #testing tag")
-    print()
+    assert count_notes_by_tag("testing") >= 1
+
+
+def test_archive_flow(priority1_note):
+    note_id = priority1_note["ZUNIQUEIDENTIFIER"]
 
     # Test 5: Archive the note
-    print("Test 5: Archiving the note...")
     result = archive_note(note_id)
-    print(f"Result: {result}")
-    time.sleep(1)
-    print()
+    assert result["success"], result
 
     # Test 6: Verify note is archived
-    print("Test 6: Verifying note is archived...")
-    archived = get_archived_notes()
-    archived_ids = [n["ZUNIQUEIDENTIFIER"] for n in archived]
-    if note_id in archived_ids:
-        print(f"✓ Note successfully archived!")
-        print(f"  Total archived notes: {len(archived)}")
-    else:
-        print("✗ Note not found in archived notes")
-    print()
+    assert wait_until(lambda: is_note_archived(note_id)), "Note not found in archived notes"
+    assert count_archived_notes() >= 1
 
     # Test 7: Unarchive the note
-    print("Test 7: Unarchiving the note...")
-    result = unarchive_note(note_id)
-    print(f"Result: {result}")
-    time.sleep(1)
-    print()
-
     # Test 8: Open notes with specific tag
-    print("Test 8: Opening Bear with #mcp tag...")
-    result = open_tag("mcp")
-    print(f"Result: {result}")
-    time.sleep(1)
-    print()
-
-    # Test 9: Rename tag (optional, commented out to avoid changing real tags)
-    print("Test 9: Tag rename capability available")
-    print("  (Skipping actual rename to avoid changing your tags)")
-    print("  Usage: rename_tag('oldtag', 'newtag')")
-    print()
-
-    # Cleanup
-    input("Press Enter to archive and cleanup test note (or Ctrl+C to keep)...")
-    print("Cleanup: Archiving test note...")
-    archive_note(note_id)
-    print("✓ Test note archived")
-    print()
-else:
-    print("✗ Could not find test note. Make sure Bear is running!")
-    print()
-
-print("=" * 70)
-print("Priority 1 Feature Tests Completed!")
-print("=" * 70)
-print()
-print("Summary of Priority 1 Features:")
-print("  ✓ Archive/Unarchive notes")
-print("  ✓ Get notes by tag")
-print("  ✓ Get note by ID")
-print("  ✓ Get archived notes")
-print("  ✓ Open Bear with specific tag")
-print("  ✓ Rename tags across all notes")
-print()
-print("All Priority 1 features are ready for production use!")
+    # Neither needs an answer from Bear, so both go out in one batch and the
+    # database is polled once afterwards.
+    with batched() as result:
+        unarchive_note(note_id)
+        open_tag("mcp")
+    assert result["success"], result
+    assert wait_until(lambda: not is_note_archived(note_id)), "Note is still archived"
+
+
+@pytest.mark.skip(reason="Renaming would change real tags; usage: rename_tag('oldtag', 'newtag')")
+def test_rename_tag():
+    # Test 9: Rename tag
+    rename_tag("oldtag", "newtag")
@@ -2,6 +2,7 @@
 """Test that all tools are registered correctly."""
 
 import asyncio
+from collections import defaultdict
 from mcp_bear.server import list_tools
 
 async def test_tools():
@@ -12,14 +13,11 @@ async def test_tools():
     print("=" * 60)
     print()
 
-    read_tools = []
-    write_tools = []
-
+    buckets = defaultdict(list)
     for tool in tools:
-        if tool.name.startswith("get_"):
-            read_tools.append(tool.name)
-        else:
-            write_tools.append(tool.name)
+        buckets["read" if tool.name.startswith("get_") else "write"].append(tool.name)
+    read_tools = buckets["read"]
+    write_tools = buckets["write"]
 
     print("READ OPERATIONS:")
     for tool_name in read_tools: